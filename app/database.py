@@ -1,19 +1,59 @@
+from contextvars import ContextVar
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./data/tracker.db"
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    # Keep connections open across requests instead of reconnecting per request
+    poolclass=QueuePool,
+    pool_size=20,
+    max_overflow=10,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    # Room for every distinct statement shape so compiled SQL is reused
+    query_cache_size=1200,
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# One session per HTTP request. Sync routes and dependencies may run on
+# different threadpool threads, so the scope is a context variable set by
+# DBSessionMiddleware rather than the default thread-local.
+_request_scope = ContextVar("db_request_scope", default=None)
+SessionLocal = scoped_session(SessionFactory, scopefunc=_request_scope.get)
 
 Base = declarative_base()
 
+class DBSessionMiddleware:
+    """Pure ASGI middleware that scopes SessionLocal to the request and removes it at the end."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _request_scope.set(object())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            SessionLocal.remove()
+            _request_scope.reset(token)
+
 def get_db():
-    db = SessionLocal()
+    if _request_scope.get() is not None:
+        # Inside DBSessionMiddleware, which removes the session after the response
+        yield SessionLocal()
+        return
+    # Websockets, background tasks, scripts: a short-lived session of their own
+    db = SessionFactory()
     try:
         yield db
     finally:
         db.close()
+
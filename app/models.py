@@ -1,18 +1,23 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Float, Date, DateTime
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Float, Date, DateTime, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from .database import Base
 from datetime import datetime
+import os
+
+# Relationship loading strategy; set SQLA_LAZY=raise_on_sql in dev/CI so an
+# accidental lazy load fails loudly instead of issuing a hidden query.
+LAZY = os.getenv("SQLA_LAZY", "select")
 
 class User(Base):
     __tablename__ = "users"
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, index=True)
-    hashed_password = Column(String)
+    hashed_password = Column(LargeBinary)
     role = Column(String)  # "admin", "freelancer", "client"
     client_id = Column(Integer, ForeignKey("clients.id"), nullable=True) # Linked if role is client
 
-    client = relationship("Client", back_populates="user")
+    client = relationship("Client", back_populates="user", lazy=LAZY)
 
 class Client(Base):
     __tablename__ = "clients"
@@ -21,11 +26,14 @@ class Client(Base):
     name = Column(String, unique=True, index=True)
     email = Column(String)
     
-    user = relationship("User", back_populates="client", uselist=False)
-    projects = relationship("Project", back_populates="client")
+    user = relationship("User", back_populates="client", uselist=False, lazy=LAZY)
+    projects = relationship("Project", back_populates="client", lazy=LAZY)
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_project_status_client", "status", "client_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
@@ -34,12 +42,15 @@ class Project(Base):
     budget = Column(Float)
     client_id = Column(Integer, ForeignKey("clients.id"))
 
-    client = relationship("Client", back_populates="projects")
-    time_entries = relationship("TimeEntry", back_populates="project")
-    invoices = relationship("Invoice", back_populates="project")
+    client = relationship("Client", back_populates="projects", lazy=LAZY)
+    time_entries = relationship("TimeEntry", back_populates="project", lazy=LAZY)
+    invoices = relationship("Invoice", back_populates="project", lazy=LAZY)
 
 class TimeEntry(Base):
     __tablename__ = "time_entries"
+    __table_args__ = (
+        Index("ix_time_project_date", "project_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
@@ -47,10 +58,14 @@ class TimeEntry(Base):
     hours = Column(Float)
     description = Column(String)
 
-    project = relationship("Project", back_populates="time_entries")
+    project = relationship("Project", back_populates="time_entries", lazy=LAZY)
 
 class Invoice(Base):
     __tablename__ = "invoices"
+    __table_args__ = (
+        Index("ix_invoice_status_project", "status", "project_id"),
+        Index("ix_invoice_status_date", "status", "issued_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
@@ -58,4 +73,4 @@ class Invoice(Base):
     issued_date = Column(Date, default=datetime.utcnow)
     status = Column(String)  # "draft", "sent", "paid"
 
-    project = relationship("Project", back_populates="invoices")
+    project = relationship("Project", back_populates="invoices", lazy=LAZY)